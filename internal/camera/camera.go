@@ -1,7 +1,18 @@
 package camera
 
-import "context"
+import (
+	"context"
+	"errors"
+)
+
+var ErrNoPreview = errors.New("camera has no preview stream")
 
 type Camera interface {
 	Capture(ctx context.Context) ([]byte, error)
 }
+
+// Previewer 由能提供低分辨率子码流快照的摄像头实现。
+// 没有配置子码流时返回 ErrNoPreview。
+type Previewer interface {
+	CapturePreview(ctx context.Context) ([]byte, error)
+}
@@ -6,11 +6,22 @@ import (
 	"fmt"
 	"io"
 	"net/http"
+	"net/url"
+	"strconv"
 	"time"
+
+	"lipcoder/face/internal/camera"
 )
 
+// 超过这个大小的 Content-Length 不预分配，退回 io.ReadAll
+const maxSnapshotSize = 32 << 20
+
 type Hik struct {
 	client *http.Client
+	// 主码流快照地址，识别用
+	url string
+	// 子码流快照地址，只用来判断画面变化，没有配置时为空
+	subURL string
 	Config
 }
 
@@ -18,6 +29,14 @@ type Config struct {
 	Host     string
 	Username string
 	Password string
+
+	// 快照分辨率，由摄像头直接缩放后编码，为 0 时使用摄像头默认分辨率。
+	// 配置了 SubHost 时只缩放子码流，主码流保持原分辨率给识别用
+	Width  int
+	Height int
+
+	// 可选，子码流（Channels/102）快照地址，用来判断画面有没有变化
+	SubHost string
 }
 
 func NewHik(cfg Config, client *http.Client) (*Hik, error) {
@@ -30,6 +49,25 @@ func NewHik(cfg Config, client *http.Client) (*Hik, error) {
 	if cfg.Password == "" {
 		return nil, errors.New("hikvision password cannot be empty")
 	}
+	if cfg.Width < 0 || cfg.Height < 0 {
+		return nil, errors.New("hikvision snapshot size cannot be negative")
+	}
+	if (cfg.Width == 0) != (cfg.Height == 0) {
+		return nil, errors.New("hikvision snapshot width and height must be set together")
+	}
+
+	snapshotURL := cfg.Host
+	subURL := ""
+
+	var err error
+	if cfg.SubHost == "" {
+		snapshotURL, err = buildSnapshotURL(cfg.Host, cfg.Width, cfg.Height)
+	} else {
+		subURL, err = buildSnapshotURL(cfg.SubHost, cfg.Width, cfg.Height)
+	}
+	if err != nil {
+		return nil, err
+	}
 
 	if client == nil {
 		client = &http.Client{
@@ -43,10 +81,31 @@ func NewHik(cfg Config, client *http.Client) (*Hik, error) {
 
 	return &Hik{
 		client: client,
+		url:    snapshotURL,
+		subURL: subURL,
 		Config: cfg,
 	}, nil
 }
 
+// 在快照地址上带上 ISAPI 的分辨率参数
+func buildSnapshotURL(host string, width, height int) (string, error) {
+	if width == 0 && height == 0 {
+		return host, nil
+	}
+
+	u, err := url.Parse(host)
+	if err != nil {
+		return "", fmt.Errorf("%w parse host failed: %w", ErrUrl, err)
+	}
+
+	query := u.Query()
+	query.Set("videoResolutionWidth", strconv.Itoa(width))
+	query.Set("videoResolutionHeight", strconv.Itoa(height))
+	u.RawQuery = query.Encode()
+
+	return u.String(), nil
+}
+
 var (
 	ErrUrl     = errors.New("url failed")
 	ErrRequest = errors.New("request failed")
@@ -56,7 +115,7 @@ var (
 func (a *Hik) Capture(context context.Context) ([]byte, error) {
 	con := a.Config
 
-	imageBytes, err := a.getWebImage(con.Host, con.Username, con.Password)
+	imageBytes, err := a.getWebImage(a.url, con.Username, con.Password)
 	if err != nil {
 		return nil, fmt.Errorf("capture hikvision image: %w", err)
 	}
@@ -64,6 +123,21 @@ func (a *Hik) Capture(context context.Context) ([]byte, error) {
 	return imageBytes, nil
 }
 
+// CapturePreview 抓取子码流快照，分辨率低，只用来判断画面有没有变化
+func (a *Hik) CapturePreview(context context.Context) ([]byte, error) {
+	con := a.Config
+	if a.subURL == "" {
+		return nil, camera.ErrNoPreview
+	}
+
+	imageBytes, err := a.getWebImage(a.subURL, con.Username, con.Password)
+	if err != nil {
+		return nil, fmt.Errorf("capture hikvision preview image: %w", err)
+	}
+
+	return imageBytes, nil
+}
+
 func (a *Hik) getWebImage(URL, username, passwd string) ([]byte, error) {
 	req, err := http.NewRequest(http.MethodGet, URL, nil)
 	if err != nil {
@@ -93,7 +167,7 @@ func (a *Hik) getWebImage(URL, username, passwd string) ([]byte, error) {
 	}
 
 	// ErrImage
-	imageBytes, err := io.ReadAll(resp.Body)
+	imageBytes, err := readBody(resp)
 	if err != nil {
 		return nil, fmt.Errorf("%w: read body failed: %w", ErrImage, err)
 	}
@@ -105,6 +179,20 @@ func (a *Hik) getWebImage(URL, username, passwd string) ([]byte, error) {
 	return imageBytes, nil
 }
 
+// 按 Content-Length 一次分配好快照缓冲区，避免 io.ReadAll 逐步扩容反复拷贝
+func readBody(resp *http.Response) ([]byte, error) {
+	if resp.ContentLength <= 0 || resp.ContentLength > maxSnapshotSize {
+		return io.ReadAll(resp.Body)
+	}
+
+	body := make([]byte, resp.ContentLength)
+	if _, err := io.ReadFull(resp.Body, body); err != nil {
+		return nil, err
+	}
+
+	return body, nil
+}
+
 func validateImageBytes(body []byte) error {
 	if len(body) == 0 {
 		return errors.New("empty image body")
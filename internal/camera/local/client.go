@@ -10,6 +10,18 @@ import (
 
 type Local int
 
+const (
+	// 预热期间驱动缓存下来的旧帧数量，读取前先丢掉
+	staleFrames = 3
+	// JPEG 编码质量，默认的 95 编码慢、体积大，对人脸识别没有帮助
+	jpegQuality = 80
+)
+
+// 每次只编码一帧，多线程收益很小，还会和同机运行的 InspireFace 推理抢 CPU
+func init() {
+	gocv.SetNumThreads(1)
+}
+
 var (
 	ErrNilCamera = errors.New("camera failed")
 	ErrNilImages = errors.New("images failed")
@@ -43,6 +55,9 @@ func (a Local) getLocalImage() ([]byte, error) {
 
 	time.Sleep(500 * time.Millisecond)
 
+	// 只 grab 不解码，跳过缓存的旧帧，保证读到的是最新画面
+	webcam.Grab(staleFrames)
+
 	var ok bool
 	for i := 0; i < 20; i++ {
 		if webcam.Read(&img) && !img.Empty() {
@@ -56,7 +71,7 @@ func (a Local) getLocalImage() ([]byte, error) {
 		return nil, ErrNilCamera
 	}
 
-	buf, err := gocv.IMEncode(".jpg", img)
+	buf, err := gocv.IMEncodeWithParams(".jpg", img, []int{int(gocv.IMWriteJpegQuality), jpegQuality})
 	if err != nil {
 		return nil, fmt.Errorf("%w Encoding JPG failed %w", ErrNilImages, err)
 	}
@@ -2,26 +2,22 @@ package config
 
 import (
 	"errors"
+	"fmt"
 	"os"
+	"strconv"
+
+	"lipcoder/face/internal/camera/hikvision"
+	"lipcoder/face/internal/recognition/inspireface"
 
 	"github.com/joho/godotenv"
 )
 
+// 直接使用各客户端自己的 Config，避免两份字段定义慢慢对不上
 type Config struct {
 	DatabaseURL string
 
-	Hikvision HikvisionConfig
-	Inspireface InspirefaceConfig
-}
-
-type HikvisionConfig struct {
-	Host     string
-	Username string
-	Password string
-}
-
-type InspirefaceConfig struct {
-	Host string
+	Hikvision   hikvision.Config
+	Inspireface inspireface.Config
 }
 
 func Load() (Config, error) {
@@ -29,12 +25,13 @@ func Load() (Config, error) {
 
 	cfg := Config{
 		DatabaseURL: os.Getenv("DATABASE_URL"),
-		Hikvision: HikvisionConfig{
+		Hikvision: hikvision.Config{
 			Host:     os.Getenv("HIKVISION_HOST"),
 			Username: os.Getenv("HIKVISION_USERNAME"),
 			Password: os.Getenv("HIKVISION_PASSWORD"),
+			SubHost:  os.Getenv("HIKVISION_SUB_HOST"),
 		},
-		Inspireface: InspirefaceConfig{
+		Inspireface: inspireface.Config{
 			Host: os.Getenv("INSPIREFACE_HOST"),
 		},
 	}
@@ -55,5 +52,30 @@ func Load() (Config, error) {
 		return Config{}, errors.New("INSPIREFACE_HOST cannot be empty")
 	}
 
+	var err error
+	cfg.Hikvision.Width, err = optionalInt("HIKVISION_SNAPSHOT_WIDTH")
+	if err != nil {
+		return Config{}, err
+	}
+	cfg.Hikvision.Height, err = optionalInt("HIKVISION_SNAPSHOT_HEIGHT")
+	if err != nil {
+		return Config{}, err
+	}
+
 	return cfg, nil
-}
\ No newline at end of file
+}
+
+// 读取可选的整数环境变量，未设置时返回 0
+func optionalInt(key string) (int, error) {
+	value := os.Getenv(key)
+	if value == "" {
+		return 0, nil
+	}
+
+	n, err := strconv.Atoi(value)
+	if err != nil {
+		return 0, fmt.Errorf("%s must be an integer: %w", key, err)
+	}
+
+	return n, nil
+}
@@ -9,6 +9,7 @@ import (
 	"math"
 	"strconv"
 	"strings"
+	"sync"
 
 	"github.com/lib/pq"
 )
@@ -151,6 +152,15 @@ func (s *Store) SearchFaceByEmbedding(
 	return name, similarity, nil
 }
 
+// 序列化 embedding 的缓冲区，每次识别都要用，复用避免反复扩容
+var vectorBufPool = sync.Pool{
+	New: func() any {
+		// 每个分量最长约 24 个字符
+		buf := make([]byte, 0, embeddingDim*24)
+		return &buf
+	},
+}
+
 func embeddingToPGVector(embedding []float64) (string, error) {
 	if len(embedding) == 0 {
 		return "", errors.New("embedding cannot be empty")
@@ -164,8 +174,10 @@ func embeddingToPGVector(embedding []float64) (string, error) {
 		)
 	}
 
-	var builder strings.Builder
-	builder.WriteByte('[')
+	bufPtr := vectorBufPool.Get().(*[]byte)
+	defer vectorBufPool.Put(bufPtr)
+
+	buf := append((*bufPtr)[:0], '[')
 
 	for i, value := range embedding {
 		if math.IsNaN(value) || math.IsInf(value, 0) {
@@ -173,15 +185,16 @@ func embeddingToPGVector(embedding []float64) (string, error) {
 		}
 
 		if i > 0 {
-			builder.WriteByte(',')
+			buf = append(buf, ',')
 		}
 
-		builder.WriteString(strconv.FormatFloat(value, 'g', -1, 64))
+		buf = strconv.AppendFloat(buf, value, 'g', -1, 64)
 	}
 
-	builder.WriteByte(']')
+	buf = append(buf, ']')
+	*bufPtr = buf
 
-	return builder.String(), nil
+	return string(buf), nil
 }
 
 func isUniqueViolation(err error) bool {
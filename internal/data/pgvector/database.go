@@ -11,6 +11,9 @@ import (
 
 const embeddingDim = 512
 
+// 启动预热最多占用的时间，大表的 pg_prewarm 读不完也不能拖慢 Init
+const warmupTimeout = 5 * time.Second
+
 type Store struct {
 	db *sql.DB
 }
@@ -47,6 +50,8 @@ func Init(ctx context.Context, databaseURL string) (*Store, error) {
 		return nil, err
 	}
 
+	store.warmup(ctx)
+
 	return store, nil
 }
 
@@ -78,3 +83,33 @@ func (s *Store) initSchema(ctx context.Context) error {
 
 	return nil
 }
+
+// warmup 把 faces 表和 HNSW 索引提前读进 shared buffers，
+// 避免启动后第一次识别要从磁盘冷读索引页。
+// 只是优化，任何一步失败都不影响启动；最多占用 warmupTimeout，超时直接放弃。
+func (s *Store) warmup(ctx context.Context) {
+	ctx, cancel := context.WithTimeout(ctx, warmupTimeout)
+	defer cancel()
+
+	// 只在数据库已经装了 pg_prewarm 时使用，不在这里建扩展；没有就只靠下面的预热查询
+	var hasPrewarm bool
+	err := s.db.QueryRowContext(ctx, `
+		SELECT EXISTS (
+			SELECT 1
+			FROM pg_extension
+			WHERE extname = 'pg_prewarm'
+		)
+	`).Scan(&hasPrewarm)
+
+	if err == nil && hasPrewarm {
+		_, _ = s.db.ExecContext(ctx, `
+			SELECT pg_prewarm('faces'), pg_prewarm('faces_embedding_hnsw_idx')
+		`)
+	}
+
+	// 用一个单位向量走一遍索引查询，顺便建立好连接池里的第一个连接
+	embedding := make([]float64, embeddingDim)
+	embedding[0] = 1
+
+	_, _, _ = s.SearchFaceByEmbedding(ctx, embedding, 0)
+}
@@ -0,0 +1,53 @@
+package imageutil
+
+import (
+	"bytes"
+	"image"
+	_ "image/jpeg"
+	_ "image/png"
+
+	"gocv.io/x/gocv"
+)
+
+const (
+	// 超过这个像素数的照片按 1/2 分辨率解码
+	reducePixels = 2_000_000
+	// 缩小后最长边不足这个值时仍用原图
+	reduceMinSide = 400
+	// 重新编码的 JPEG 质量，默认的 95 编码慢、体积大，对人脸识别没有帮助
+	jpegQuality = 80
+)
+
+// ReduceImage 大照片用 IMREAD_REDUCED_COLOR_2 在解码阶段直接缩小一半再编码成 JPEG，
+// 识别服务要解码和检测的像素少 4 倍；不需要缩小或缩小失败时返回原图。
+// 可以作为 service.EnrollFromDir 的 reduce 参数。
+func ReduceImage(imageBytes []byte) []byte {
+	// 标准库这里只认 JPEG/PNG，只读文件头就能跳过小图；
+	// BMP/WebP 等其他格式交给 OpenCV 缩小解码后再判断大小
+	cfg, _, err := image.DecodeConfig(bytes.NewReader(imageBytes))
+	if err == nil && cfg.Width*cfg.Height <= reducePixels {
+		return imageBytes
+	}
+
+	img, err := gocv.IMDecode(imageBytes, gocv.IMReadReducedColor2)
+	if err != nil {
+		return imageBytes
+	}
+	defer img.Close()
+
+	// 缩小后的像素数乘 4 就是原图大小
+	if img.Empty() || img.Cols()*img.Rows()*4 <= reducePixels {
+		return imageBytes
+	}
+	if max(img.Cols(), img.Rows()) < reduceMinSide {
+		return imageBytes
+	}
+
+	buf, err := gocv.IMEncodeWithParams(".jpg", img, []int{int(gocv.IMWriteJpegQuality), jpegQuality})
+	if err != nil {
+		return imageBytes
+	}
+	defer buf.Close()
+
+	return bytes.Clone(buf.GetBytes())
+}
@@ -0,0 +1,187 @@
+package service
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"io"
+	"lipcoder/face/internal/data"
+	"lipcoder/face/internal/recognition"
+	"os"
+	"path/filepath"
+	"runtime"
+	"strings"
+	"sync"
+)
+
+// 每次从目录里读取的条目数
+const enrollReadDirBatch = 256
+
+// ImageReducer 在送去识别前缩小录入照片，不需要缩小时原样返回。
+// imageutil.ReduceImage 是基于 OpenCV 的实现，放在单独的包里，service 不依赖 cgo
+type ImageReducer func(imageBytes []byte) []byte
+
+type EnrollResult struct {
+	Name string
+	ID   int64
+	Err  error
+}
+
+type enrollEmbedding struct {
+	name      string
+	embedding []float64
+	err       error
+}
+
+// EnrollFromDir 把目录里的照片批量录入人脸库，文件名（去掉扩展名）作为 name。
+// 读图和提取 embedding 由 workers 个协程并发完成，写数据库保持串行。
+// 单张照片失败只记录在对应的 EnrollResult 里，不影响其他照片。
+// reduce 可以为 nil，此时照片原样送去识别。
+func EnrollFromDir(
+	ctx context.Context,
+	dir string,
+	rec recognition.Recognition,
+	facedb data.Facedb,
+	workers int,
+	reduce ImageReducer,
+) ([]EnrollResult, error) {
+	if rec == nil {
+		return nil, errors.New("recognition cannot be nil")
+	}
+	if facedb == nil {
+		return nil, errors.New("facedb cannot be nil")
+	}
+
+	if workers <= 0 {
+		workers = runtime.NumCPU()
+	}
+
+	dirFile, err := os.Open(dir)
+	if err != nil {
+		return nil, fmt.Errorf("open enroll dir: %w", err)
+	}
+	defer dirFile.Close()
+
+	jobs := make(chan string)
+	embeddings := make(chan enrollEmbedding)
+
+	// 分批读目录，边读边派发，不用等整个目录列完再排序。
+	// 读目录的协程退出时把错误（没有错误时为 nil）放进 readDone
+	readDone := make(chan error, 1)
+	go func() {
+		var readErr error
+		defer func() {
+			close(jobs)
+			readDone <- readErr
+		}()
+
+		for {
+			entries, err := dirFile.ReadDir(enrollReadDirBatch)
+			for _, entry := range entries {
+				if entry.IsDir() || !isImageFile(entry.Name()) {
+					continue
+				}
+
+				select {
+				case <-ctx.Done():
+					return
+				case jobs <- filepath.Join(dir, entry.Name()):
+				}
+			}
+
+			if errors.Is(err, io.EOF) {
+				return
+			}
+			if err != nil {
+				readErr = fmt.Errorf("read enroll dir: %w", err)
+				return
+			}
+		}
+	}()
+
+	var wg sync.WaitGroup
+	for i := 0; i < workers; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			for path := range jobs {
+				item := embeddingFromFile(path, rec, reduce)
+
+				select {
+				case <-ctx.Done():
+					return
+				case embeddings <- item:
+				}
+			}
+		}()
+	}
+
+	go func() {
+		wg.Wait()
+		close(embeddings)
+	}()
+
+	var results []EnrollResult
+	for item := range embeddings {
+		if item.err != nil {
+			results = append(results, EnrollResult{Name: item.name, Err: item.err})
+			continue
+		}
+
+		id, err := facedb.AddFace(ctx, item.name, item.embedding)
+		if err != nil && !errors.Is(err, data.ErrAlreadyExists) {
+			err = fmt.Errorf("add face to database: %w", err)
+		}
+
+		results = append(results, EnrollResult{Name: item.name, ID: id, Err: err})
+	}
+
+	// 取消时 worker 可能先于读目录的协程退出，等它结束再关闭目录
+	if readErr := <-readDone; readErr != nil {
+		return results, readErr
+	}
+
+	return results, ctx.Err()
+}
+
+// 读取一张录入照片并提取 embedding，照片里必须只有一张脸
+func embeddingFromFile(path string, rec recognition.Recognition, reduce ImageReducer) enrollEmbedding {
+	base := filepath.Base(path)
+	item := enrollEmbedding{
+		name: strings.TrimSuffix(base, filepath.Ext(base)),
+	}
+
+	imageBytes, err := os.ReadFile(path)
+	if err != nil {
+		item.err = fmt.Errorf("read enroll image: %w", err)
+		return item
+	}
+
+	if reduce != nil {
+		imageBytes = reduce(imageBytes)
+	}
+
+	embedding, err := rec.GetFaceEmbedding(imageBytes, 0)
+	if err != nil {
+		item.err = fmt.Errorf("get embedding from recognition response: %w", err)
+		return item
+	}
+	if len(embedding) == 0 {
+		item.err = recognition.ErrNoFaceEmbedding
+		return item
+	}
+
+	item.embedding = embedding[0]
+
+	return item
+}
+
+func isImageFile(name string) bool {
+	switch strings.ToLower(filepath.Ext(name)) {
+	case ".jpg", ".jpeg", ".png", ".bmp", ".webp":
+		return true
+	default:
+		return false
+	}
+}
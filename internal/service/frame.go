@@ -0,0 +1,129 @@
+package service
+
+import (
+	"bytes"
+	"encoding/binary"
+	"fmt"
+	"image"
+	"image/color"
+	"image/jpeg"
+	"sync/atomic"
+)
+
+const (
+	// 判断画面变化用的灰度缩略图边长
+	thumbSize = 64
+	// 缩略图平均灰度差低于这个值认为画面没有变化
+	minFrameChange = 2.0
+)
+
+// frameHash 把整张快照按 8 字节一组做异或-乘法折叠。
+// 乘以奇数常数让各个位置的差异不会像纯异或那样线性抵消。
+// 只用来判断画面是否变化（摄像头卡帧），不需要加密哈希。
+func frameHash(frame []byte) uint64 {
+	// 黄金分割比的 64 位奇数常数，乘法在 mod 2^64 下可逆
+	const mix64 = 0x9E3779B97F4A7C15
+
+	hash := uint64(len(frame))
+
+	for len(frame) >= 8 {
+		hash = (hash ^ binary.LittleEndian.Uint64(frame)) * mix64
+		frame = frame[8:]
+	}
+
+	for _, b := range frame {
+		hash = (hash ^ uint64(b)) * mix64
+	}
+
+	return hash
+}
+
+// frameThumbnail 把 JPEG 快照解码后最近邻采样成 thumbSize*thumbSize 的灰度图，写入 thumb。
+// 标准库只能完整解码，1080p 一帧要几十毫秒，只用在子码流快照上
+func frameThumbnail(imageBytes []byte, thumb []byte) error {
+	img, err := jpeg.Decode(bytes.NewReader(imageBytes))
+	if err != nil {
+		return fmt.Errorf("decode frame thumbnail: %w", err)
+	}
+
+	bounds := img.Bounds()
+	width, height := bounds.Dx(), bounds.Dy()
+
+	for ty := 0; ty < thumbSize; ty++ {
+		y := bounds.Min.Y + (2*ty+1)*height/(2*thumbSize)
+
+		for tx := 0; tx < thumbSize; tx++ {
+			x := bounds.Min.X + (2*tx+1)*width/(2*thumbSize)
+
+			// JPEG 解码出来一般是 YCbCr，直接取亮度平面
+			switch m := img.(type) {
+			case *image.YCbCr:
+				thumb[ty*thumbSize+tx] = m.Y[m.YOffset(x, y)]
+			case *image.Gray:
+				thumb[ty*thumbSize+tx] = m.Pix[m.PixOffset(x, y)]
+			default:
+				thumb[ty*thumbSize+tx] = color.GrayModel.Convert(img.At(x, y)).(color.Gray).Y
+			}
+		}
+	}
+
+	return nil
+}
+
+// thumbnailDiff 返回两张缩略图的平均绝对灰度差
+func thumbnailDiff(a, b []byte) float64 {
+	var sum int
+	for i := range a {
+		d := int(a[i]) - int(b[i])
+		if d < 0 {
+			d = -d
+		}
+		sum += d
+	}
+
+	return float64(sum) / float64(len(a))
+}
+
+// latestFrame 只保留最新的一帧，识别跟不上时旧帧直接被覆盖。
+// 写入是整帧替换指针，读取不需要加锁；每次写入后通过 ready 通知识别协程。
+type latestFrame struct {
+	current atomic.Pointer[publishedFrame]
+	ready   chan struct{}
+}
+
+type publishedFrame struct {
+	image []byte
+	seq   uint64
+}
+
+func newLatestFrame() *latestFrame {
+	return &latestFrame{
+		ready: make(chan struct{}, 1),
+	}
+}
+
+// put 只由抓帧协程调用，seq 不会被并发写
+func (f *latestFrame) put(image []byte) {
+	seq := uint64(1)
+	if prev := f.current.Load(); prev != nil {
+		seq = prev.seq + 1
+	}
+
+	f.current.Store(&publishedFrame{image: image, seq: seq})
+
+	// 已经有未处理的通知时不用再发，识别协程醒来会取到最新帧
+	select {
+	case f.ready <- struct{}{}:
+	default:
+	}
+}
+
+// getNew 返回比 lastSeq 更新的帧，没有新帧时 ok 为 false
+func (f *latestFrame) getNew(lastSeq uint64) (image []byte, seq uint64, ok bool) {
+	current := f.current.Load()
+	if current == nil || current.seq == lastSeq {
+		return nil, lastSeq, false
+	}
+
+	return current.image, current.seq, true
+}
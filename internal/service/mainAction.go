@@ -11,6 +11,8 @@ import (
 	"sync"
 )
 
+// AdminRequest 的 Reply 最好带缓冲（容量至少 1），这样管理循环只做非阻塞发送，
+// 不会被不读结果的调用方卡住；不带缓冲时会一直等调用方接收。用 NewAdminRequest 创建。
 type AdminRequest struct {
 	name   string
 	action string
@@ -19,6 +21,21 @@ type AdminRequest struct {
 	Reply  chan AdminResult
 }
 
+func NewAdminRequest(
+	action string,
+	name string,
+	cam camera.Camera,
+	rec recognition.Recognition,
+) AdminRequest {
+	return AdminRequest{
+		name:   name,
+		action: action,
+		cam:    cam,
+		rec:    rec,
+		Reply:  make(chan AdminResult, 1),
+	}
+}
+
 type AdminResult struct {
 	action string
 	name   string
@@ -196,7 +213,8 @@ func addFaceFromCamera(
 	return id, nil
 }
 
-// 返回请求
+// 返回请求。每个请求只回复一次，Reply 带缓冲时一定能放进去，不会阻塞管理循环；
+// 不带缓冲的 Reply 退回阻塞发送，直到调用方接收或 ctx 结束
 func sendAdminResult(
 	ctx context.Context,
 	reply chan AdminResult,
@@ -206,11 +224,16 @@ func sendAdminResult(
 		return
 	}
 
-	select {
-	case <-ctx.Done():
+	if cap(reply) > 0 {
+		select {
+		case reply <- result:
+		default:
+		}
 		return
+	}
 
+	select {
+	case <-ctx.Done():
 	case reply <- result:
-		return
 	}
 }
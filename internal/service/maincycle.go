@@ -24,7 +24,7 @@ func SignIn(
 	facedb data.Facedb,
 	interval time.Duration,
 	similarity float64,
-) error {
+) (err error) {
 	if cam == nil {
 		return fmt.Errorf("camera cannot be nil")
 	}
@@ -43,16 +43,48 @@ func SignIn(
 		similarity = DefaultFaceSimilarity
 	}
 
-	ticker := time.NewTicker(interval)
-	defer ticker.Stop()
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	// 抓帧和识别分开跑，识别慢的时候摄像头不用等
+	slot := newLatestFrame()
+	grabErr := make(chan error, 1)
+	go func() {
+		grabErr <- grabFrames(ctx, cam, interval, slot)
+	}()
+
+	// 考勤记录后台批量写入，退出时把队列里剩下的写完
+	recorder := newAttendanceRecorder()
+	defer func() {
+		closeErr := recorder.close()
+		// 写入错误已经在循环里返回过的不再重复
+		if closeErr == nil || errors.Is(err, recorder.err) {
+			return
+		}
+		err = errors.Join(err, fmt.Errorf("write attendance record file %w", closeErr))
+	}()
+
+	var lastSeq uint64
 
 	for {
 		select {
 		case <-ctx.Done():
 			return ctx.Err()
 
-		case <-ticker.C:
-			bestembedding, err := extractBestEmbeddingFromCamera(ctx, cam, rec)
+		case err := <-grabErr:
+			return err
+
+		case <-recorder.done:
+			return fmt.Errorf("write attendance record file %w", recorder.err)
+
+		case <-slot.ready:
+			imageBytes, seq, ok := slot.getNew(lastSeq)
+			if !ok {
+				continue
+			}
+			lastSeq = seq
+
+			bestembedding, err := extractBestEmbedding(ctx, imageBytes, rec)
 			if errors.Is(err, recognition.ErrNoFace) {
 				continue
 			}
@@ -71,7 +103,7 @@ func SignIn(
 				return fmt.Errorf("attendance search face failed %w", err)
 			}
 
-			err = RecordFaceSimilarity(name, facesimilarity)
+			err = recorder.record(ctx, name, facesimilarity)
 			if err != nil {
 				return fmt.Errorf("write attendance record file %w", err)
 			}
@@ -79,22 +111,92 @@ func SignIn(
 	}
 }
 
-func extractBestEmbeddingFromCamera(
+// 每隔interval抓一次快照（优先子码流）判断画面有没有变化，
+// 有变化时再抓一张主码流快照覆盖到slot里，识别只对主码流做一次
+func grabFrames(
 	ctx context.Context,
 	cam camera.Camera,
-	rec recognition.Recognition,
-) ([]float64, error) {
-	select {
-	case <-ctx.Done():
-		return nil, ctx.Err()
-	default:
+	interval time.Duration,
+	slot *latestFrame,
+) error {
+	ticker := time.NewTicker(interval)
+	defer ticker.Stop()
+
+	var lastHash uint64
+
+	// 两块缩略图缓冲区轮换使用，不用每帧重新分配
+	thumb := make([]byte, thumbSize*thumbSize)
+	lastThumb := make([]byte, thumbSize*thumbSize)
+	hasLastThumb := false
+
+	for {
+		select {
+		case <-ctx.Done():
+			return ctx.Err()
+
+		case <-ticker.C:
+			imageBytes, preview, err := captureFrame(ctx, cam)
+			if err != nil {
+				return fmt.Errorf("mainCycle get image failed,%w", err)
+			}
+
+			// 画面和上一帧完全相同（摄像头卡帧），不再重复识别
+			hash := frameHash(imageBytes)
+			if hash == lastHash {
+				continue
+			}
+			lastHash = hash
+
+			// 和上一张送去识别的画面差别太小（没人走动），跳过识别。
+			// 要完整解码 JPEG，只对低分辨率的子码流做，主码流解码太慢
+			if preview {
+				if err := frameThumbnail(imageBytes, thumb); err == nil {
+					if hasLastThumb && thumbnailDiff(thumb, lastThumb) < minFrameChange {
+						continue
+					}
+					thumb, lastThumb = lastThumb, thumb
+					hasLastThumb = true
+				}
+			}
+
+			// 子码流只用来判断画面变化，识别用主码流
+			if preview {
+				imageBytes, err = cam.Capture(ctx)
+				if err != nil {
+					return fmt.Errorf("mainCycle get image failed,%w", err)
+				}
+			}
+
+			slot.put(imageBytes)
+		}
 	}
+}
 
-	imageBytes, err := cam.Capture(ctx)
+// 摄像头有子码流时先抓子码流快照，没有时退回主码流
+func captureFrame(ctx context.Context, cam camera.Camera) (imageBytes []byte, preview bool, err error) {
+	if previewer, ok := cam.(camera.Previewer); ok {
+		imageBytes, err := previewer.CapturePreview(ctx)
+		if err == nil {
+			return imageBytes, true, nil
+		}
+		if !errors.Is(err, camera.ErrNoPreview) {
+			return nil, false, err
+		}
+	}
+
+	imageBytes, err = cam.Capture(ctx)
 	if err != nil {
-		return nil, fmt.Errorf("mainCycle get image failed,%w", err)
+		return nil, false, err
 	}
 
+	return imageBytes, false, nil
+}
+
+func extractBestEmbedding(
+	ctx context.Context,
+	imageBytes []byte,
+	rec recognition.Recognition,
+) ([]float64, error) {
 	select {
 	case <-ctx.Done():
 		return nil, ctx.Err()
@@ -1,66 +1,272 @@
 package service
 
 import (
+	"bufio"
+	"context"
 	"fmt"
 	"os"
 	"path/filepath"
+	"strconv"
 	"strings"
 	"sync"
 	"time"
 )
 
-var attendanceRecordMu sync.Mutex
+const (
+	// 等待写入的考勤记录队列长度，写满后 attendanceRecorder.record 会等待
+	attendanceQueueSize = 256
+	// 后台协程每次最多合并写入的记录数
+	attendanceBatchSize = 64
+)
+
+// 队列里只放原始数据，时区转换和格式化都在后台协程里做
+type attendanceRecord struct {
+	at         time.Time
+	name       string
+	similarity float64
+}
+
+// 同步写入和后台批量写入可能同时写同一个文件，按批加锁，行不会交错
+var attendanceFileMu sync.Mutex
+
+// 考勤记录目录 <启动目录>/data，只解析一次
+var attendanceDataDir = sync.OnceValues(func() (string, error) {
+	wd, err := os.Getwd()
+	if err != nil {
+		return "", err
+	}
+
+	return filepath.Join(wd, "data"), nil
+})
+
+// 考勤记录统一用北京时间，时区只在启动时加载一次
+var attendanceLocation = loadAttendanceLocation()
 
+func loadAttendanceLocation() *time.Location {
+	loc, err := time.LoadLocation("Asia/Shanghai")
+	if err != nil {
+		return time.FixedZone("CST", 8*60*60)
+	}
+
+	return loc
+}
+
+// RecordFaceSimilarity 同步写入一条考勤记录，写完才返回。
+// SignIn 里连续识别用的是后台批量写入的 attendanceRecorder。
 func RecordFaceSimilarity(name string, faceSimilarity float64) error {
-	attendanceRecordMu.Lock()
-	defer attendanceRecordMu.Unlock()
+	name, err := cleanAttendanceName(name)
+	if err != nil {
+		return err
+	}
+
+	var writer attendanceWriter
+	err = writeAttendanceBatch(&writer, []attendanceRecord{{
+		at:         time.Now(),
+		name:       name,
+		similarity: faceSimilarity,
+	}})
+	closeErr := writer.close()
 
+	if err != nil {
+		return err
+	}
+
+	return closeErr
+}
+
+func cleanAttendanceName(name string) (string, error) {
 	name = strings.TrimSpace(name)
 	name = strings.ReplaceAll(name, "\n", "_")
 	name = strings.ReplaceAll(name, "\r", "_")
 
 	if name == "" {
-		return fmt.Errorf("name cannot be empty")
+		return "", fmt.Errorf("name cannot be empty")
 	}
 
-	loc, err := time.LoadLocation("Asia/Shanghai")
-	if err != nil {
-		loc = time.FixedZone("CST", 8*60*60)
+	return name, nil
+}
+
+// attendanceRecorder 在后台协程里批量写考勤记录，文件一直保持打开。
+// 写入失败时后台协程退出并关闭 done；用完必须调用 close 把队列里的记录写完。
+type attendanceRecorder struct {
+	queue chan attendanceRecord
+	done  chan struct{}
+	// done 关闭后才能读
+	err error
+}
+
+func newAttendanceRecorder() *attendanceRecorder {
+	r := &attendanceRecorder{
+		queue: make(chan attendanceRecord, attendanceQueueSize),
+		done:  make(chan struct{}),
 	}
 
-	now := time.Now().In(loc)
+	go r.run()
 
-	wd, err := os.Getwd()
+	return r
+}
+
+// record 把一条记录放进队列，队列满时等待；后台协程已经出错退出时返回它的错误
+func (r *attendanceRecorder) record(ctx context.Context, name string, faceSimilarity float64) error {
+	name, err := cleanAttendanceName(name)
 	if err != nil {
 		return err
 	}
 
-	dataDir := filepath.Join(wd, "data")
+	select {
+	case <-r.done:
+		return r.err
+	default:
+	}
+
+	select {
+	case <-ctx.Done():
+		return ctx.Err()
+	case <-r.done:
+		return r.err
+	case r.queue <- attendanceRecord{
+		at:         time.Now(),
+		name:       name,
+		similarity: faceSimilarity,
+	}:
+		return nil
+	}
+}
+
+// close 停止接收新记录，等后台协程把队列里剩下的记录写完并关闭文件
+func (r *attendanceRecorder) close() error {
+	close(r.queue)
+	<-r.done
+
+	if r.err != nil && len(r.queue) > 0 {
+		return fmt.Errorf("%w (%d queued records not written)", r.err, len(r.queue))
+	}
+
+	return r.err
+}
+
+// 队列里积压的记录合并成一批写入后再 flush，出错立即退出
+func (r *attendanceRecorder) run() {
+	defer close(r.done)
+
+	var writer attendanceWriter
+	batch := make([]attendanceRecord, 0, attendanceBatchSize)
+
+	for record := range r.queue {
+		batch = append(batch[:0], record)
+
+	drain:
+		for len(batch) < attendanceBatchSize {
+			select {
+			case record, ok := <-r.queue:
+				if !ok {
+					break drain
+				}
+				batch = append(batch, record)
+			default:
+				break drain
+			}
+		}
+
+		if err := writeAttendanceBatch(&writer, batch); err != nil {
+			_ = writer.close()
+			r.err = fmt.Errorf("write %d attendance records: %w", len(batch), err)
+			return
+		}
+	}
+
+	r.err = writer.close()
+}
+
+func writeAttendanceBatch(writer *attendanceWriter, batch []attendanceRecord) error {
+	attendanceFileMu.Lock()
+	defer attendanceFileMu.Unlock()
+
+	return writer.writeBatch(batch)
+}
+
+type attendanceWriter struct {
+	day    string
+	file   *os.File
+	writer *bufio.Writer
+	// 格式化日期和记录行的缓冲区，每条记录复用
+	dayBuf  []byte
+	lineBuf []byte
+}
+
+// 每条记录写成一行 "15:04 name 0.123456"
+func (w *attendanceWriter) writeBatch(batch []attendanceRecord) error {
+	for _, record := range batch {
+		at := record.at.In(attendanceLocation)
+
+		w.dayBuf = at.AppendFormat(w.dayBuf[:0], "2006-01-02")
+		if w.file == nil || w.day != string(w.dayBuf) {
+			if err := w.open(string(w.dayBuf)); err != nil {
+				return err
+			}
+		}
+
+		line := at.AppendFormat(w.lineBuf[:0], "15:04")
+		line = append(line, ' ')
+		line = append(line, record.name...)
+		line = append(line, ' ')
+		line = strconv.AppendFloat(line, record.similarity, 'f', 6, 64)
+		line = append(line, '\n')
+		w.lineBuf = line
+
+		if _, err := w.writer.Write(line); err != nil {
+			return err
+		}
+	}
+
+	return w.writer.Flush()
+}
+
+// 跨天时关掉旧文件，打开 data/<day>.txt
+func (w *attendanceWriter) open(day string) error {
+	if err := w.close(); err != nil {
+		return err
+	}
+
+	dataDir, err := attendanceDataDir()
+	if err != nil {
+		return err
+	}
 
 	if err := os.MkdirAll(dataDir, 0755); err != nil {
 		return err
 	}
 
-	fileName := now.Format("2006-01-02") + ".txt"
-	filePath := filepath.Join(dataDir, fileName)
+	filePath := filepath.Join(dataDir, day+".txt")
 
 	file, err := os.OpenFile(filePath, os.O_CREATE|os.O_APPEND|os.O_WRONLY, 0644)
 	if err != nil {
 		return err
 	}
 
-	line := fmt.Sprintf(
-		"%s %s %.6f\n",
-		now.Format("15:04"),
-		name,
-		faceSimilarity,
-	)
+	if w.writer == nil {
+		w.writer = bufio.NewWriter(file)
+	} else {
+		w.writer.Reset(file)
+	}
+
+	w.day = day
+	w.file = file
+
+	return nil
+}
+
+func (w *attendanceWriter) close() error {
+	if w.file == nil {
+		return nil
+	}
 
-	_, writeErr := file.WriteString(line)
-	closeErr := file.Close()
+	flushErr := w.writer.Flush()
+	closeErr := w.file.Close()
+	w.file = nil
 
-	if writeErr != nil {
-		return writeErr
+	if flushErr != nil {
+		return flushErr
 	}
 
 	return closeErr